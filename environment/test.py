@@ -1,7 +1,6 @@
 import pygame
 import numpy as np
 from enum import Enum
-import math
 import random
 
 # Initialize Pygame
@@ -17,6 +16,9 @@ BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 DARK_GRAY = (64, 64, 64)
 
+BUILDING_SIZE = 40
+UI_HEIGHT = 60  # Height of the button bar at the top of the screen
+
 class GameState(Enum):
     PLACING_BUILDING = 1
     DRAWING_ROAD = 2
@@ -28,69 +30,91 @@ class BuildingType(Enum):
     DESTINATION = 2  # Buildings that receive cars
 
 class Button:
+    __slots__ = ('rect', 'color', 'text', 'font', 'active',
+                 '_backgrounds', '_text_surface', '_text_rect')
+
     def __init__(self, x, y, width, height, text, color):
         self.rect = pygame.Rect(x, y, width, height)
         self.color = color
         self.text = text
         self.font = pygame.font.Font(None, 30)
         self.active = False
+        self._backgrounds = {
+            active: self._make_background((*color, 200) if active else (*color, 255))
+            for active in (False, True)
+        }
+        self._text_surface = self.font.render(text, True, BLACK)
+        self._text_rect = self._text_surface.get_rect(center=self.rect.center)
 
-    def draw(self, screen):
-        color = (*self.color, 200) if self.active else (*self.color, 255)
-        pygame.draw.rect(screen, color, self.rect)
-        pygame.draw.rect(screen, BLACK, self.rect, 2)
-        
-        text_surface = self.font.render(self.text, True, BLACK)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+    def _make_background(self, color):
+        surface = pygame.Surface(self.rect.size)
+        surface.fill(color)
+        pygame.draw.rect(surface, BLACK, surface.get_rect(), 2)
+        return surface
 
-    def is_clicked(self, pos):
-        return self.rect.collidepoint(pos)
+    def draw(self, screen):
+        screen.blit(self._backgrounds[self.active], self.rect)
+        screen.blit(self._text_surface, self._text_rect)
 
 class Building:
+    __slots__ = ('position', 'type', 'spawn_rate', 'spawn_timer', 'size',
+                 'connections', 'rect')
+
     def __init__(self, position, building_type, spawn_rate=1.0):
         self.position = position
         self.type = building_type
         self.spawn_rate = spawn_rate
         self.spawn_timer = 0
-        self.size = 40
+        self.size = BUILDING_SIZE
         self.connections = []  # Road points connected to this building
         self.rect = pygame.Rect(position[0] - self.size//2,
                               position[1] - self.size//2,
                               self.size, self.size)
-    
-    def draw(self, screen):
-        color = BLUE if self.type == BuildingType.SOURCE else GREEN
-        pygame.draw.rect(screen, color, self.rect)
-        # Draw highlight if building has connections
-        if self.connections:
-            pygame.draw.rect(screen, YELLOW, self.rect, 2)
 
-    def is_clicked(self, pos):
-        return self.rect.collidepoint(pos)
+def make_circle_surface(color, radius):
+    surface = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+    pygame.draw.circle(surface, color, (radius, radius), radius)
+    return surface
+
+JOINT_RADIUS = 5
+JOINT_SURFACE = make_circle_surface(DARK_GRAY, JOINT_RADIUS)
 
 class Road:
-    def __init__(self):
-        self.points = []
+    __slots__ = ('_points', 'num_points', 'width', 'connected_buildings')
+
+    def __init__(self, capacity=8):
+        # Preallocated point buffer; only the first num_points rows are used
+        self._points = np.empty((capacity, 2), dtype=np.int32)
+        self.num_points = 0
         self.width = 20
         self.connected_buildings = []  # Keep track of connected buildings
     
+    @property
+    def points(self):
+        return self._points[:self.num_points]
+    
     def add_point(self, point):
-        self.points.append(point)
+        if self.num_points == len(self._points):
+            points = self._points
+            self._points = np.empty((2 * len(points), 2), dtype=np.int32)
+            self._points[:self.num_points] = points
+        self._points[self.num_points] = point
+        self.num_points += 1
     
-    def draw(self, screen):
-        if len(self.points) < 2:
+    def draw_segments(self, screen):
+        if self.num_points < 2:
+            return
+        
+        # Draw road segments as one polyline
+        pygame.draw.lines(screen, GRAY, False, self.points, self.width)
+    
+    def draw_points(self, screen):
+        if self.num_points < 2:
             return
         
-        # Draw road segments
-        for i in range(len(self.points) - 1):
-            start = self.points[i]
-            end = self.points[i + 1]
-            pygame.draw.line(screen, GRAY, start, end, self.width)
-            
         # Draw connection points
-        for point in self.points:
-            pygame.draw.circle(screen, DARK_GRAY, point, 5)
+        screen.blits([(JOINT_SURFACE, (x - JOINT_RADIUS, y - JOINT_RADIUS))
+                      for x, y in self.points.tolist()], doreturn=False)
             
         # Highlight end points if connected to buildings
         for building in self.connected_buildings:
@@ -98,16 +122,13 @@ class Road:
             pygame.draw.circle(screen, YELLOW, closest_point, 8)
 
     def get_closest_point(self, position):
-        closest_point = None
-        min_distance = float('inf')
+        if self.num_points == 0:
+            return None
         
-        for point in self.points:
-            dist = math.hypot(point[0] - position[0], point[1] - position[1])
-            if dist < min_distance:
-                min_distance = dist
-                closest_point = point
-                
-        return closest_point
+        # Compare squared distances; the argmin is the same without the sqrt
+        offsets = self.points - np.asarray(position, dtype=np.int32)
+        dist_sq = (offsets * offsets).sum(axis=1)
+        return tuple(self.points[dist_sq.argmin()].tolist())
 
 class TrafficSimulation:
     def __init__(self, width=1200, height=800):
@@ -132,6 +153,17 @@ class TrafficSimulation:
         self.spawn_rate = 1.0
         self.selected_building = None  # For road connections
         
+        # Spawn rate label, rendered once per distinct value
+        self._font = pygame.font.Font(None, 36)
+        self._spawn_text_cache = {}
+        
+        # Pre-rendered building sprites, keyed by (type, has connections)
+        self._building_surfaces = {
+            (building_type, connected): self._make_building_surface(building_type, connected)
+            for building_type in BuildingType
+            for connected in (False, True)
+        }
+        
         # Create buttons
         button_y = 10
         button_height = 40
@@ -144,6 +176,66 @@ class TrafficSimulation:
         }
         self.buttons['source'].active = True
         
+        # Hit-test rects, parallel to self.buttons and self.buildings
+        self._button_names = list(self.buttons)
+        self._button_rects = [button.rect for button in self.buttons.values()]
+        self._building_rects = []
+        
+        # Cached button bar, redrawn only when a button changes state.
+        # White is keyed out so roads under the bar stay visible.
+        self._ui_surface = pygame.Surface((width, UI_HEIGHT)).convert()
+        self._ui_surface.set_colorkey(WHITE)
+        self._render_ui()
+        
+        # Cached roads, buildings and traffic lights, redrawn only after edits
+        self._static_surface = pygame.Surface((width, height)).convert()
+        self._static_dirty = True
+        
+    def _render_ui(self):
+        self._ui_surface.fill(WHITE)
+        for button in self.buttons.values():
+            button.draw(self._ui_surface)
+        
+    def _render_static(self):
+        surface = self._static_surface
+        surface.fill(WHITE)
+        
+        # Draw all road segments under one surface lock (blits need it unlocked),
+        # then the connection points on top
+        surface.lock()
+        try:
+            for road in self.roads:
+                road.draw_segments(surface)
+        finally:
+            surface.unlock()
+        for road in self.roads:
+            road.draw_points(surface)
+        
+        self._draw_buildings_and_lights(surface)
+        self._static_dirty = False
+        
+    def _draw_buildings_and_lights(self, surface):
+        # Draw buildings in a single batched blit
+        surface.blits([(self._building_surfaces[(building.type, bool(building.connections))],
+                        building.rect)
+                       for building in self.buildings], doreturn=False)
+        
+        # Draw traffic lights
+        for light in self.traffic_lights:
+            light.draw(surface)
+        
+    def _make_building_surface(self, building_type, connected):
+        surface = pygame.Surface((BUILDING_SIZE, BUILDING_SIZE)).convert()
+        surface.fill(BLUE if building_type == BuildingType.SOURCE else GREEN)
+        if connected:
+            pygame.draw.rect(surface, YELLOW, surface.get_rect(), 2)
+        return surface
+        
+    def add_building(self, building):
+        self.buildings.append(building)
+        self._building_rects.append(building.rect)
+        self._static_dirty = True
+        
     def set_state(self, new_state):
         self.state = new_state
         # Reset all buttons
@@ -162,6 +254,8 @@ class TrafficSimulation:
             self.buttons['traffic_light'].active = True
         elif new_state == GameState.SIMULATING:
             self.buttons['simulate'].active = True
+        
+        self._render_ui()
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -170,43 +264,40 @@ class TrafficSimulation:
             
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_pos = pygame.mouse.get_pos()
+                mouse_rect = pygame.Rect(mouse_pos, (1, 1))
                 
                 # Check button clicks first
-                button_clicked = False
-                for name, button in self.buttons.items():
-                    if button.is_clicked(mouse_pos):
-                        button_clicked = True
-                        if name == 'source':
-                            self.selected_building_type = BuildingType.SOURCE
-                            self.set_state(GameState.PLACING_BUILDING)
-                        elif name == 'destination':
-                            self.selected_building_type = BuildingType.DESTINATION
-                            self.set_state(GameState.PLACING_BUILDING)
-                        elif name == 'road':
-                            self.set_state(GameState.DRAWING_ROAD)
-                            self.current_road = None
-                        elif name == 'traffic_light':
-                            self.set_state(GameState.PLACING_TRAFFIC_LIGHT)
-                        elif name == 'simulate':
-                            self.set_state(GameState.SIMULATING)
-                
-                if button_clicked:
+                button_index = mouse_rect.collidelist(self._button_rects)
+                if button_index != -1:
+                    name = self._button_names[button_index]
+                    if name == 'source':
+                        self.selected_building_type = BuildingType.SOURCE
+                        self.set_state(GameState.PLACING_BUILDING)
+                    elif name == 'destination':
+                        self.selected_building_type = BuildingType.DESTINATION
+                        self.set_state(GameState.PLACING_BUILDING)
+                    elif name == 'road':
+                        self.set_state(GameState.DRAWING_ROAD)
+                        self.current_road = None
+                    elif name == 'traffic_light':
+                        self.set_state(GameState.PLACING_TRAFFIC_LIGHT)
+                    elif name == 'simulate':
+                        self.set_state(GameState.SIMULATING)
                     continue
                 
                 # Handle game state actions
                 if self.state == GameState.PLACING_BUILDING:
-                    if mouse_pos[1] > 60:  # Don't place buildings over UI
-                        self.buildings.append(Building(mouse_pos, 
-                                                    self.selected_building_type,
-                                                    self.spawn_rate))
+                    if mouse_pos[1] > UI_HEIGHT:  # Don't place buildings over UI
+                        self.add_building(Building(mouse_pos,
+                                                   self.selected_building_type,
+                                                   self.spawn_rate))
                 
                 elif self.state == GameState.DRAWING_ROAD:
                     # Check if clicked on a building
+                    building_index = mouse_rect.collidelist(self._building_rects)
                     clicked_building = None
-                    for building in self.buildings:
-                        if building.is_clicked(mouse_pos):
-                            clicked_building = building
-                            break
+                    if building_index != -1:
+                        clicked_building = self.buildings[building_index]
                     
                     if clicked_building:
                         if not self.current_road:
@@ -226,9 +317,11 @@ class TrafficSimulation:
                         # Add road point if not clicking building
                         if self.current_road:
                             self.current_road.add_point(mouse_pos)
+                    self._static_dirty = True
                 
                 elif self.state == GameState.PLACING_TRAFFIC_LIGHT:
                     self.traffic_lights.append(TrafficLight(mouse_pos))
+                    self._static_dirty = True
             
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
@@ -239,44 +332,36 @@ class TrafficSimulation:
                     self.spawn_rate = max(0.1, self.spawn_rate - 0.1)
     
     def draw(self):
-        # Fill background
-        self.screen.fill(WHITE)
-        
-        # Draw roads
-        for road in self.roads:
-            road.draw(self.screen)
+        # Draw background, roads, buildings and traffic lights
+        if self._static_dirty:
+            self._render_static()
+        self.screen.blit(self._static_surface, (0, 0))
         
         # Draw current road being placed
         if self.current_road:
-            self.current_road.draw(self.screen)
             # Draw line from last point to mouse
-            if self.current_road.points:
+            if self.current_road.num_points:
                 mouse_pos = pygame.mouse.get_pos()
                 pygame.draw.line(self.screen, GRAY, 
                                self.current_road.points[-1], 
                                mouse_pos, 
                                self.current_road.width)
-        
-        # Draw buildings
-        for building in self.buildings:
-            building.draw(self.screen)
-        
-        # Draw traffic lights
-        for light in self.traffic_lights:
-            light.draw(self.screen)
+                # Keep buildings and traffic lights above the road being placed
+                self._draw_buildings_and_lights(self.screen)
         
         # Draw cars
         for car in self.cars:
             car.draw(self.screen)
         
         # Draw UI
-        for button in self.buttons.values():
-            button.draw(self.screen)
+        self.screen.blit(self._ui_surface, (0, 0))
         
         # Draw spawn rate
-        font = pygame.font.Font(None, 36)
         spawn_text = f"Spawn Rate: {self.spawn_rate:.1f}"
-        spawn_surface = font.render(spawn_text, True, BLACK)
+        spawn_surface = self._spawn_text_cache.get(spawn_text)
+        if spawn_surface is None:
+            spawn_surface = self._font.render(spawn_text, True, BLACK)
+            self._spawn_text_cache[spawn_text] = spawn_surface
         self.screen.blit(spawn_surface, (810, 20))
         
         pygame.display.flip()